@@ -0,0 +1,126 @@
+"""
+Fixed-size Bloom filter for streaming headline deduplication
+"""
+
+import logging
+from array import array
+
+import mmh3
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """
+    Bloom filter over a fixed array('Q') bitset
+
+    Bit positions are derived from a single 128-bit MurmurHash3 via
+    Kirsch-Mitzenmacher double hashing (h1 + i * h2). Once the fraction of
+    set bits exceeds max_fill the filter is cleared, bounding the false
+    positive rate at the cost of forgetting older entries.
+
+    The hashes of the most recent insertions are also kept in a ring of
+    parallel uint64 arrays and re-inserted when the filter is cleared, so
+    headlines FinnHub is still re-serving are not let through again.
+    """
+
+    def __init__(
+        self,
+        size_bytes: int = 8192,
+        num_hashes: int = 7,
+        max_fill: float = 0.5,
+        recent_size: int = 256
+    ):
+        """
+        Initialize an empty filter
+
+        Args:
+            size_bytes: Size of the bitset (must be a multiple of 8)
+            num_hashes: Number of bit positions set per entry
+            max_fill: Fraction of set bits that triggers a reset
+            recent_size: Number of recent entries carried over a reset
+        """
+        if size_bytes <= 0 or size_bytes % 8:
+            raise ValueError(f"size_bytes must be a positive multiple of 8, got {size_bytes}")
+        if num_hashes <= 0:
+            raise ValueError(f"num_hashes must be positive, got {num_hashes}")
+        if not 0 < max_fill <= 1:
+            raise ValueError(f"max_fill must be in (0, 1], got {max_fill}")
+        if recent_size < 0:
+            raise ValueError(f"recent_size must be non-negative, got {recent_size}")
+
+        self.num_bits = size_bytes * 8
+        self.num_hashes = num_hashes
+        self.max_fill = max_fill
+        self._bits = array('Q', bytes(size_bytes))
+        self._bits_set = 0
+
+        # Ring of recent (h1, h2) pairs, stored as two contiguous arrays
+        self._recent_h1 = np.zeros(recent_size, dtype=np.uint64)
+        self._recent_h2 = np.zeros(recent_size, dtype=np.uint64)
+        self._recent_next = 0
+        self._recent_count = 0
+
+    @property
+    def fill(self) -> float:
+        """Fraction of bits currently set"""
+        return self._bits_set / self.num_bits
+
+    def add(self, key: str) -> bool:
+        """
+        Insert a key into the filter
+
+        Args:
+            key: Key to insert
+
+        Returns:
+            True if the key was probably already present, False if it is new
+        """
+        h1, h2 = mmh3.hash64(key, signed=False)
+        positions = self._positions(h1, h2)
+
+        bits = self._bits
+        if all(bits[p >> 6] & (1 << (p & 63)) for p in positions):
+            return True
+
+        if self.fill >= self.max_fill:
+            logger.debug(f"Bloom filter reached {self.fill:.0%} fill, resetting")
+            self._clear_bits()
+            for recent_h1, recent_h2 in zip(self._recent_h1[:self._recent_count].tolist(),
+                                            self._recent_h2[:self._recent_count].tolist()):
+                self._set_bits(self._positions(recent_h1, recent_h2))
+
+        self._set_bits(positions)
+
+        size = len(self._recent_h1)
+        if size:
+            self._recent_h1[self._recent_next] = h1
+            self._recent_h2[self._recent_next] = h2
+            self._recent_next = (self._recent_next + 1) % size
+            self._recent_count = min(self._recent_count + 1, size)
+        return False
+
+    def reset(self):
+        """Clear all entries"""
+        self._clear_bits()
+        self._recent_next = 0
+        self._recent_count = 0
+
+    def _positions(self, h1: int, h2: int):
+        """Bit positions for a hash pair"""
+        return [(h1 + i * h2) % self.num_bits for i in range(self.num_hashes)]
+
+    def _set_bits(self, positions):
+        """Set the given bit positions, tracking the number of set bits"""
+        bits = self._bits
+        for p in positions:
+            mask = 1 << (p & 63)
+            if not bits[p >> 6] & mask:
+                bits[p >> 6] |= mask
+                self._bits_set += 1
+
+    def _clear_bits(self):
+        """Clear the bitset only"""
+        self._bits = array('Q', bytes(len(self._bits) * 8))
+        self._bits_set = 0
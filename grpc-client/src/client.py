@@ -3,6 +3,8 @@ gRPC Client for FinnHub Headlines
 Streams headlines to the inference server
 """
 
+import asyncio
+import functools
 import grpc
 import logging
 import os
@@ -10,14 +12,23 @@ import sys
 import yaml
 import time
 import finnhub
-from typing import List, Dict, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, AsyncIterator
 from dotenv import load_dotenv
+from src.bloom_filter import BloomFilter
 
 # Add generated proto files to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'generated'))
 
 import headlines_pb2
 import headlines_pb2_grpc
+from google.protobuf.internal import api_implementation
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 logging.basicConfig(
     level=logging.INFO,
@@ -37,8 +48,13 @@ class HeadlinesStreamClient:
         self.finnhub_client = finnhub.Client(api_key=config['finnhub_api_key'])
         self.symbols = config.get('symbols', ['AAPL', 'MSFT'])
         self.poll_interval = config.get('poll_interval', 2)  # seconds
+        # Hold new headlines until at least min_batch_size are pending or the
+        # oldest has waited max_batch_delay_ms, so the server gets fewer, larger batches
+        self.min_batch_size = config.get('min_batch_size', 1)
+        self.max_batch_delay_ms = config.get('max_batch_delay_ms', 0)
         self.stub = None
         self.channel = None
+        self._fetch_pool = None
     
     def _get_server_address(self) -> str:
         """Get server address based on configuration mode"""
@@ -52,92 +68,133 @@ class HeadlinesStreamClient:
         else:
             raise ValueError(f"Unknown mode: {self.mode}")
     
-    def connect(self):
+    async def connect(self):
         """Establish connection to gRPC server"""
         address = self._get_server_address()
         logger.info(f"Connecting to server at {address} (mode: {self.mode})")
         
+        max_message_size = self.server_config.get('max_message_size', 10 * 1024 * 1024)
+        options = [
+            ('grpc.max_send_message_length', max_message_size),
+            ('grpc.max_receive_message_length', max_message_size),
+            # Keep the long-lived headline stream alive between polls
+            ('grpc.keepalive_time_ms', 20000),
+            ('grpc.keepalive_timeout_ms', 10000),
+            ('grpc.http2.max_pings_without_data', 0),
+            ('grpc.http2.min_time_between_pings_ms', 10000),
+        ]
+        
         if self.mode == 'uds':
-            # For Unix Domain Sockets
-            self.channel = grpc.secure_channel(
+            # For Unix Domain Sockets (same host, compression would only cost CPU).
+            # Insecure to match the server's add_insecure_port on the socket.
+            self.channel = grpc.aio.insecure_channel(
                 address,
-                grpc.local_channel_credentials()
+                options=options,
+                compression=grpc.Compression.NoCompression
             )
         else:
-            # For TCP
+            # For TCP (headline text compresses well)
             host = self.server_config.get('host', 'localhost')
             port = self.server_config.get('port', 50051)
-            self.channel = grpc.insecure_channel(f'{host}:{port}')
+            self.channel = grpc.aio.insecure_channel(
+                f'{host}:{port}',
+                options=options,
+                compression=grpc.Compression.Gzip
+            )
         
         self.stub = headlines_pb2_grpc.HeadlineServiceStub(self.channel)
         logger.info("Connected to server successfully")
+        
+        # One thread per symbol so a poll costs one FinnHub round trip, not one per symbol
+        self._fetch_pool = ThreadPoolExecutor(
+            max_workers=max(1, min(32, len(self.symbols))),
+            thread_name_prefix='finnhub'
+        )
     
-    def _headline_batch_generator(self) -> Iterator[headlines_pb2.HeadlineBatch]:
+    async def _headline_batch_generator(self) -> AsyncIterator[headlines_pb2.HeadlineBatch]:
         """
-        Generator that yields headline batches from FinnHub
-        Runs continuously, polling every poll_interval seconds
+        Async generator that yields headline batches from FinnHub
+        Runs continuously, polling every poll_interval seconds; new headlines
+        from several polls may be combined into one batch (see min_batch_size)
         """
-        last_headlines = {symbol: set() for symbol in self.symbols}
+        loop = asyncio.get_running_loop()
+        seen_headlines = {symbol: BloomFilter() for symbol in self.symbols}
+        pending = []
+        pending_since = None  # batch_timestamp of the oldest pending poll
         
         while True:
             all_headlines = []
             batch_timestamp = int(time.time() * 1000)  # milliseconds
             
-            for symbol in self.symbols:
-                try:
-                    headlines = self.finnhub_client.company_news(symbol, _from=0, to=9)
-                    logger.debug(f"Retrieved {len(headlines)} headlines for {symbol}")
+            # The FinnHub client is blocking; fetch all symbols in parallel off the event loop
+            responses = await asyncio.gather(
+                *(
+                    loop.run_in_executor(
+                        self._fetch_pool,
+                        functools.partial(self.finnhub_client.company_news, symbol, _from=0, to=9)
+                    )
+                    for symbol in self.symbols
+                ),
+                return_exceptions=True
+            )
+            
+            for symbol, headlines in zip(self.symbols, responses):
+                if isinstance(headlines, Exception):
+                    logger.error(f"Error fetching headlines for {symbol}: {headlines}")
+                    continue
+                
+                logger.debug(f"Retrieved {len(headlines)} headlines for {symbol}")
+                
+                for headline_data in headlines:
+                    headline_text = headline_data.get('headline', '')
+                    timestamp = headline_data.get('datetime', batch_timestamp)
+                    source = headline_data.get('source', 'FinnHub')
                     
-                    for headline_data in headlines:
-                        headline_text = headline_data.get('headline', '')
-                        timestamp = headline_data.get('datetime', batch_timestamp)
-                        source = headline_data.get('source', 'FinnHub')
-                        
-                        # Create a unique identifier for this headline
-                        headline_id = (headline_text, timestamp)
-                        
-                        # Only include if we haven't seen this exact headline before
-                        if headline_id not in last_headlines[symbol]:
-                            all_headlines.append(
-                                headlines_pb2.HeadlineRequest(
-                                    headline=headline_text,
-                                    timestamp=timestamp,
-                                    symbol=symbol,
-                                    source=source
-                                )
-                            )
-                            last_headlines[symbol].add(headline_id)
+                    # Create a unique identifier for this headline
+                    headline_id = f"{headline_text}\x00{timestamp}"
                     
-                    # Keep only recent headlines in memory (last 100 per symbol)
-                    if len(last_headlines[symbol]) > 100:
-                        # Convert set to list, keep last 100
-                        items = list(last_headlines[symbol])
-                        last_headlines[symbol] = set(items[-100:])
-                        
-                except Exception as e:
-                    logger.error(f"Error fetching headlines for {symbol}: {e}")
-                    continue
+                    # Only include if we haven't (probably) seen this exact headline before
+                    if not seen_headlines[symbol].add(headline_id):
+                        all_headlines.append(
+                            headlines_pb2.HeadlineRequest(
+                                headline=headline_text,
+                                timestamp=timestamp,
+                                symbol=symbol,
+                                source=source
+                            )
+                        )
             
             if all_headlines:
-                logger.info(f"Yielding batch with {len(all_headlines)} new headlines")
-                yield headlines_pb2.HeadlineBatch(
-                    headlines=all_headlines,
-                    batch_timestamp=batch_timestamp
-                )
+                if not pending:
+                    pending_since = batch_timestamp
+                pending.extend(all_headlines)
             else:
                 logger.debug("No new headlines in this poll")
             
+            waited_ms = int(time.time() * 1000) - (pending_since or 0)
+            if pending and (len(pending) >= self.min_batch_size or waited_ms >= self.max_batch_delay_ms):
+                logger.info(f"Yielding batch with {len(pending)} new headlines")
+                yield headlines_pb2.HeadlineBatch(
+                    headlines=pending,
+                    batch_timestamp=pending_since
+                )
+                pending = []
+            
             # Wait before next poll
-            time.sleep(self.poll_interval)
+            await asyncio.sleep(self.poll_interval)
     
-    def stream_headlines(self):
+    async def stream_headlines(self):
         """Stream headlines to the server"""
         try:
             logger.info(f"Starting to stream headlines for symbols: {self.symbols}")
             logger.info(f"Poll interval: {self.poll_interval} seconds")
+            logger.info(
+                f"Batching: min {self.min_batch_size} headlines, "
+                f"max delay {self.max_batch_delay_ms} ms"
+            )
             
             # Call the streaming RPC
-            response = self.stub.IngestHeadlines(self._headline_batch_generator())
+            response = await self.stub.IngestHeadlines(self._headline_batch_generator())
             
             logger.info(
                 f"Streaming complete. "
@@ -152,10 +209,12 @@ class HeadlinesStreamClient:
             logger.error(f"Error streaming headlines: {e}", exc_info=True)
             raise
     
-    def close(self):
+    async def close(self):
         """Close the connection"""
+        if self._fetch_pool:
+            self._fetch_pool.shutdown(wait=False)
         if self.channel:
-            self.channel.close()
+            await self.channel.close()
             logger.info("Connection closed")
 
 
@@ -168,7 +227,7 @@ def load_config(profile: str = 'tcp') -> Dict:
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     
     logger.info(f"Loaded configuration from {config_path}")
     return config
@@ -190,6 +249,16 @@ def load_finnhub_api_key() -> str:
     return api_key
 
 
+async def run_client(config: Dict):
+    """Connect, stream headlines until interrupted, then close the channel"""
+    client = HeadlinesStreamClient(config)
+    await client.connect()
+    try:
+        await client.stream_headlines()
+    finally:
+        await client.close()
+
+
 def main():
     """Main entry point"""
     profile = os.getenv('APP_PROFILE', 'tcp')
@@ -199,18 +268,18 @@ def main():
     
     logger.info(f"Starting client with profile: {profile}")
     
+    # The pure-Python protobuf backend makes every batch serialization far slower
+    if api_implementation.Type() == 'python':
+        logger.warning("Using the pure-Python protobuf backend; install a protobuf wheel with upb/cpp support")
+    
     try:
         # Load configuration and API key
         config = load_config(profile)
         api_key = load_finnhub_api_key()
         config['finnhub_api_key'] = api_key
         
-        # Create and connect client
-        client = HeadlinesStreamClient(config)
-        client.connect()
-        
-        # Start streaming
-        client.stream_headlines()
+        # Create, connect and start streaming
+        asyncio.run(run_client(config))
         
     except FileNotFoundError as e:
         logger.error(f"Configuration error: {e}")
@@ -223,9 +292,6 @@ def main():
     except Exception as e:
         logger.error(f"Unexpected error: {e}", exc_info=True)
         sys.exit(1)
-    finally:
-        if 'client' in locals():
-            client.close()
 
 
 if __name__ == '__main__':
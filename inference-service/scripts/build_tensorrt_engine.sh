@@ -0,0 +1,54 @@
+#!/bin/bash
+
+# Build a TensorRT engine from the exported ONNX model and lay out a
+# Triton model repository for `inference.engine: triton`.
+#
+# The ONNX file is written by the service on first start with
+# `inference.engine: onnxruntime`. Serve the result with e.g.
+#   tritonserver --model-repository=<output dir>
+
+SCRIPT_DIR="$( cd "$( dirname "${BASH_SOURCE[0]}" )" && pwd )"
+PROJECT_DIR="$SCRIPT_DIR/.."
+
+ONNX_PATH=${1:-"$PROJECT_DIR/models/ProsusAI_finbert-fp32-opset17.onnx"}
+REPO_DIR=${2:-"$PROJECT_DIR/models/triton"}
+MODEL_NAME=${MODEL_NAME:-finbert}
+MAX_BATCH=${MAX_BATCH:-64}
+MAX_SEQ=${MAX_SEQ:-128}
+
+if [ ! -f "$ONNX_PATH" ]; then
+    echo "ONNX model not found: $ONNX_PATH"
+    exit 1
+fi
+
+mkdir -p "$REPO_DIR/$MODEL_NAME/1"
+
+# FP16 engine with dynamic batch and sequence dimensions. The minimum
+# sequence length is 1 because padding only rounds short batches up to the
+# next power of two (or sequence bucket), which can be below 8.
+trtexec \
+    --onnx="$ONNX_PATH" \
+    --fp16 \
+    --minShapes=input_ids:1x1,attention_mask:1x1 \
+    --optShapes=input_ids:32x64,attention_mask:32x64 \
+    --maxShapes=input_ids:${MAX_BATCH}x${MAX_SEQ},attention_mask:${MAX_BATCH}x${MAX_SEQ} \
+    --saveEngine="$REPO_DIR/$MODEL_NAME/1/model.plan" || exit 1
+
+# Triton's dynamic batcher merges concurrent requests of the same shape
+cat > "$REPO_DIR/$MODEL_NAME/config.pbtxt" <<CONFIG
+name: "$MODEL_NAME"
+platform: "tensorrt_plan"
+max_batch_size: $MAX_BATCH
+input [
+  { name: "input_ids", data_type: TYPE_INT64, dims: [ -1 ] },
+  { name: "attention_mask", data_type: TYPE_INT64, dims: [ -1 ] }
+]
+output [
+  { name: "logits", data_type: TYPE_FP32, dims: [ 3 ] }
+]
+dynamic_batching {
+  max_queue_delay_microseconds: 5000
+}
+CONFIG
+
+echo "Triton model repository written to $REPO_DIR"
@@ -1,5 +1,5 @@
 import logging
-from src.services import FinBertInferenceService, InferenceService
+from src.services import InferenceService, get_implementation
 
 logger = logging.getLogger(__name__)
 
@@ -14,7 +14,7 @@ def create_inference_service(config) -> InferenceService:
         An instance of InferenceService
         
     Raises:
-        ValueError: If model_type is unknown or missing
+        ValueError: If the implementation is unknown or missing
     """
     # Expect a full config dict; `inference` sub-dict contains model settings
     inference_config = config.get('inference', {})
@@ -24,11 +24,6 @@ def create_inference_service(config) -> InferenceService:
     if not implementation:
         raise ValueError("Missing 'inference.implementation' (or 'inference.model_type') in configuration")
 
-    if implementation == 'finbert':
-        logger.info("Creating FinBERT inference service")
-        return FinBertInferenceService(config)
-    # Add more model types here as you implement them:
-    # elif model_type == 'bert':
-    #     return BertInferenceService(config)
-    else:
-        raise ValueError(f"Unknown model_type: {model_type}")
\ No newline at end of file
+    service_class = get_implementation(implementation)
+    logger.info(f"Creating {service_class.__name__} for implementation '{implementation}'")
+    return service_class(config)
\ No newline at end of file
@@ -3,6 +3,7 @@ gRPC Inference Server for Financial News Headlines
 Streaming batches for efficient processing
 """
 
+import asyncio
 import grpc
 from concurrent import futures
 import logging
@@ -10,6 +11,7 @@ import os
 import sys
 import yaml
 from src.factory import create_inference_service
+from src.worker_pool import InferenceWorkerPool
 
 # Add generated proto files to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'generated'))
@@ -18,6 +20,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'generated'))
 # Import them under the legacy names used throughout this file.
 import headlines_pb2 as headline_pb2
 import headlines_pb2_grpc as headline_pb2_grpc
+from google.protobuf.internal import api_implementation
+
+# Prefer the libyaml-backed loader when PyYAML was built with it
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 logging.basicConfig(
     level=logging.INFO,
@@ -29,20 +38,24 @@ logger = logging.getLogger(__name__)
 class HeadlineServicer(headline_pb2_grpc.HeadlineServiceServicer):
     """gRPC servicer for headline ingestion"""
     
-    def __init__(self, inference_service):
+    def __init__(self, inference_service, inference_pool):
         self.inference_service = inference_service
+        self.inference_pool = inference_pool
         self.total_headlines = 0
         self.batch_count = 0
     
-    def IngestHeadlines(self, request_iterator, context):
+    async def IngestHeadlines(self, request_iterator, context):
         """
         Ingest stream of headline batches
         
         Each request in the stream contains a batch of headlines
-        from a single FinnHub API call.
+        from a single FinnHub API call. Inference runs off the event loop
+        so other streams keep being received while a batch is processed.
         """
+        loop = asyncio.get_running_loop()
+        
         try:
-            for batch_request in request_iterator:
+            async for batch_request in request_iterator:
                 headlines = batch_request.headlines
                 batch_timestamp = batch_request.batch_timestamp
                 
@@ -52,8 +65,12 @@ class HeadlineServicer(headline_pb2_grpc.HeadlineServiceServicer):
                     f"(timestamp: {batch_timestamp})"
                 )
                 
-                # Process the entire batch
-                self.inference_service.process_batch(headlines)
+                # Hand the batch to the inference service; with micro-batching
+                # enabled it may share a model call with other streams
+                pending = await loop.run_in_executor(
+                    self.inference_pool, self.inference_service.submit, headlines
+                )
+                await asyncio.gather(*(asyncio.wrap_future(f) for f in pending))
                 
                 self.total_headlines += len(headlines)
                 self.batch_count += 1
@@ -92,33 +109,57 @@ def load_config(profile='uds'):
         raise FileNotFoundError(f"Configuration file not found: {config_path}")
     
     with open(config_path, 'r') as f:
-        config = yaml.safe_load(f)
+        config = yaml.load(f, Loader=SafeLoader)
     
     logger.info(f"Loaded configuration from {config_path}")
     return config
 
 
-def serve(config):
+async def serve(config):
     """Start the gRPC server"""
     
     server_config = config['server']
     mode = server_config['mode']
     
-    # Initialize inference service (pass full configuration dict)
-    inference_service = create_inference_service(config)
+    # The pure-Python protobuf backend makes every batch parse far slower
+    if api_implementation.Type() == 'python':
+        logger.warning("Using the pure-Python protobuf backend; install a protobuf wheel with upb/cpp support")
     
-    # Create gRPC server
-    max_workers = server_config.get('max_workers', 10)
-    server = grpc.server(
-        futures.ThreadPoolExecutor(max_workers=max_workers),
+    # Initialize inference service (pass full configuration dict).
+    # On CPU, several model processes can run forward passes in parallel;
+    # GPUs use a single process and rely on micro-batching instead.
+    inference_workers = server_config.get('inference_workers', 1)
+    if inference_workers > 1 and config['inference'].get('device') == 'cpu':
+        inference_service = InferenceWorkerPool(config, inference_workers)
+    else:
+        if inference_workers > 1:
+            logger.warning("server.inference_workers > 1 is only supported on cpu, using one process")
+        inference_service = create_inference_service(config)
+    
+    # Streams are multiplexed on the event loop; inference calls are dispatched
+    # to a single thread so they never oversubscribe the model's own threads
+    inference_pool = futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='inference')
+    
+    # Create gRPC server. Headline text compresses well, so gzip over TCP;
+    # over UDS there is no wire to save and compression only costs CPU.
+    compression = grpc.Compression.Gzip if mode == 'tcp' else grpc.Compression.NoCompression
+    server = grpc.aio.server(
         options=[
             ('grpc.max_send_message_length', server_config.get('max_message_size', 10 * 1024 * 1024)),
             ('grpc.max_receive_message_length', server_config.get('max_message_size', 10 * 1024 * 1024)),
-        ]
+            # Keep long-lived streams alive, and accept the client's keepalive pings
+            ('grpc.keepalive_time_ms', 20000),
+            ('grpc.keepalive_timeout_ms', 10000),
+            ('grpc.http2.max_pings_without_data', 0),
+            ('grpc.http2.min_time_between_pings_ms', 10000),
+            ('grpc.http2.min_ping_interval_without_data_ms', 10000),
+            ('grpc.max_concurrent_streams', 1000),
+        ],
+        compression=compression
     )
     
     # Add servicer
-    servicer = HeadlineServicer(inference_service)
+    servicer = HeadlineServicer(inference_service, inference_pool)
     headline_pb2_grpc.add_HeadlineServiceServicer_to_server(servicer, server)
     
     # Configure address based on mode
@@ -145,14 +186,16 @@ def serve(config):
         raise ValueError(f"Unknown mode: {mode}")
     
     # Start server
-    server.start()
+    await server.start()
     logger.info("Server started successfully")
     
     try:
-        server.wait_for_termination()
-    except KeyboardInterrupt:
+        await server.wait_for_termination()
+    finally:
         logger.info("Shutting down...")
-        server.stop(grace=5)
+        await server.stop(grace=5)
+        inference_pool.shutdown(wait=False)
+        inference_service.cleanup()
         if mode == 'uds' and os.path.exists(server_config.get('uds_path', '')):
             os.remove(server_config['uds_path'])
 
@@ -166,4 +209,7 @@ if __name__ == '__main__':
     logger.info(f"Starting with profile: {profile}")
     
     config = load_config(profile)
-    serve(config)
\ No newline at end of file
+    try:
+        asyncio.run(serve(config))
+    except KeyboardInterrupt:
+        pass
\ No newline at end of file
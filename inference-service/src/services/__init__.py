@@ -1,4 +1,11 @@
 from .abstract_inference_service import InferenceService
-from .finbert_inference_service import FinBertInferenceService
+from .registry import register, get_implementation
 
-__all__ = ['InferenceService', 'FinBertInferenceService']
\ No newline at end of file
+__all__ = ['InferenceService', 'FinBertInferenceService', 'register', 'get_implementation']
+
+
+def __getattr__(name):
+    # Implementations are imported lazily so importing the package stays cheap
+    if name == 'FinBertInferenceService':
+        return get_implementation('finbert')
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from concurrent.futures import Future
 from typing import List
 import logging
 
@@ -36,6 +37,32 @@ class InferenceService(ABC):
         """
         pass
     
+    def submit(self, headlines: List) -> List[Future]:
+        """
+        Schedule a batch of headlines for inference
+        
+        The default implementation runs process_batch inline and returns
+        already-completed futures. Implementations that coalesce requests
+        (e.g. micro-batching) override this to return pending futures.
+        
+        Args:
+            headlines: List of HeadlineRequest objects
+            
+        Returns:
+            List of futures, one per headline, resolving to its result dict
+        """
+        pending = [Future() for _ in headlines]
+        try:
+            results = self.process_batch(headlines)
+        except Exception as e:
+            for future in pending:
+                future.set_exception(e)
+            return pending
+        
+        for future, result in zip(pending, results):
+            future.set_result(result)
+        return pending
+    
     @abstractmethod
     def _process_single(self, headline_text: str, timestamp: str) -> dict:
         """
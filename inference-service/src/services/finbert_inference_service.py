@@ -1,12 +1,21 @@
-from typing import List, Dict
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import List, Dict, Optional, Tuple
 import logging
+import os
+import queue
+import threading
+import time
+import numpy as np
 import torch
-from transformers import AutoTokenizer, AutoModelForSequenceClassification
+from transformers import AutoTokenizer, AutoModelForSequenceClassification, PreTrainedTokenizerFast
 from .abstract_inference_service import InferenceService
+from .registry import register
 
 logger = logging.getLogger(__name__)
 
 
+@register('finbert')
 class FinBertInferenceService(InferenceService):
     """FinBERT implementation of the inference service for financial sentiment analysis"""
     
@@ -16,14 +25,50 @@ class FinBertInferenceService(InferenceService):
         1: "negative", 
         2: "neutral"
     }
+    # Same labels as an array indexed by class id, for vectorized lookup
+    LABEL_NAMES = np.array([label for _, label in sorted(LABEL_MAPPING.items())])
+    
+    # Weight dtypes for each supported `inference.precision` value.
+    # int8 loads FP32 weights and dynamically quantizes Linear layers afterwards.
+    PRECISION_DTYPES = {
+        "fp32": torch.float32,
+        "fp16": torch.float16,
+        "bf16": torch.bfloat16,
+        "int8": torch.float32
+    }
+    
+    # Supported values for `inference.engine`
+    ENGINES = ("torch", "onnxruntime", "triton")
+    
+    # ONNX Runtime execution providers per device, in order of preference
+    ONNX_PROVIDERS = {
+        "cpu": ["CPUExecutionProvider"],
+        "cuda": ["CUDAExecutionProvider", "CPUExecutionProvider"],
+        "rocm": ["ROCMExecutionProvider", "CPUExecutionProvider"]
+    }
+    
+    # ONNX opset used when exporting for engine 'onnxruntime'
+    ONNX_OPSET = 17
     
     def __init__(self, config):
         """Initialize FinBERT model and tokenizer"""
         self.model = None
         self.tokenizer = None
+        self._token_cache = OrderedDict()
+        self._token_cache_lock = threading.Lock()
         self.device = None
+        self.engine = None
+        self.onnx_session = None
+        self.triton_client = None
+        self._cuda_graphs = {}
+        self._request_queue = None
+        self._batcher_thread = None
         super().__init__(config)  # This calls _validate_config and logs initialization
         self._load_model()
+        
+        # Coalesce headlines from concurrent streams into shared model calls
+        if self.config['inference'].get('micro_batch_window_ms', 0) > 0:
+            self._start_batcher()
     
     def _validate_config(self):
         """Validate FinBERT-specific configuration"""
@@ -44,42 +89,261 @@ class FinBertInferenceService(InferenceService):
         if device not in ['cpu', 'cuda', 'rocm']:
             raise ValueError(f"Device must be 'cpu', 'cuda', or 'rocm', got '{device}'")
         
+        # Validate precision
+        precision = inference_config.get('precision', 'fp32')
+        if precision not in self.PRECISION_DTYPES:
+            raise ValueError(
+                f"precision must be one of {', '.join(self.PRECISION_DTYPES)}, got '{precision}'"
+            )
+        if precision == 'int8' and device != 'cpu':
+            raise ValueError("precision 'int8' (dynamic quantization) is only supported on cpu")
+        if precision == 'fp16' and device == 'cpu':
+            raise ValueError("precision 'fp16' requires a GPU device; use 'bf16' or 'int8' on cpu")
+        
+        # Validate engine
+        engine = inference_config.get('engine', 'torch')
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {', '.join(self.ENGINES)}, got '{engine}'")
+        if engine == 'onnxruntime' and precision in ('int8', 'bf16'):
+            raise ValueError(f"precision '{precision}' is not supported with engine 'onnxruntime'")
+        
         # Validate batch_size
         if inference_config['batch_size'] <= 0:
             raise ValueError(f"batch_size must be positive, got {inference_config['batch_size']}")
+        
+        # Validate sequence length buckets
+        buckets = inference_config.get('sequence_buckets') or []
+        if any(b <= 0 for b in buckets):
+            raise ValueError(f"sequence_buckets must be positive lengths, got {buckets}")
+        
+        # Validate CUDA graph shapes
+        graph_shapes = inference_config.get('cuda_graph_shapes') or []
+        if graph_shapes:
+            if device == 'cpu' or engine != 'torch':
+                raise ValueError("cuda_graph_shapes requires a GPU device and engine 'torch'")
+            if any(len(shape) != 2 or min(shape) <= 0 for shape in graph_shapes):
+                raise ValueError(f"cuda_graph_shapes must be [batch, sequence_length] pairs, got {graph_shapes}")
+        
+        # Validate tokenizer cache size (0 disables the cache)
+        cache_size = inference_config.get('tokenizer_cache_size', 8192)
+        if cache_size < 0:
+            raise ValueError(f"tokenizer_cache_size must be non-negative, got {cache_size}")
+        
+        # Validate micro-batching window (0 disables the batcher)
+        window_ms = inference_config.get('micro_batch_window_ms', 0)
+        if window_ms < 0:
+            raise ValueError(f"micro_batch_window_ms must be non-negative, got {window_ms}")
     
     def _load_model(self):
         """Load FinBERT model and tokenizer into memory"""
         inference_config = self.config['inference']
         model_name = inference_config['model_name']
         device = inference_config['device']
+        precision = inference_config.get('precision', 'fp32')
+        self.engine = inference_config.get('engine', 'torch')
         
         logger.info(f"Loading FinBERT model: {model_name}")
-        logger.info(f"Target device: {device}")
+        logger.info(f"Target device: {device}, precision: {precision}, engine: {self.engine}")
         
         try:
             # Load tokenizer
             logger.info("Loading tokenizer...")
-            self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+            self.tokenizer = AutoTokenizer.from_pretrained(model_name, use_fast=True)
+            if not isinstance(self.tokenizer, PreTrainedTokenizerFast):
+                raise RuntimeError(
+                    f"No fast (Rust) tokenizer available for {model_name}, "
+                    f"got {type(self.tokenizer).__name__}"
+                )
+            
+            # The model is served by Triton; only the tokenizer is needed locally
+            if self.engine == 'triton':
+                self.device = torch.device('cpu')
+                self._connect_triton()
+                return
             
             # Load model
             logger.info("Loading model weights...")
-            self.model = AutoModelForSequenceClassification.from_pretrained(model_name)
+            self.model = AutoModelForSequenceClassification.from_pretrained(
+                model_name,
+                torch_dtype=self.PRECISION_DTYPES[precision]
+            )
             
             # Set device
             self.device = torch.device(device)
             self.model.to(self.device)
             
-            # Set model to evaluation mode
+            # Set model to evaluation mode; no parameter ever needs a gradient
             self.model.eval()
+            self.model.requires_grad_(False)
+            
+            if precision == 'int8':
+                logger.info("Applying dynamic int8 quantization to Linear layers...")
+                self.model = torch.quantization.quantize_dynamic(
+                    self.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
             
             logger.info(f"Model loaded successfully. Device: {self.device}")
             logger.info(f"Model parameters: {sum(p.numel() for p in self.model.parameters()):,}")
             
+            if self.engine == 'onnxruntime':
+                self._load_onnx_session()
+            elif inference_config.get('cuda_graph_shapes'):
+                # Captured graphs replace torch.compile's reduce-overhead graphs
+                self._capture_cuda_graphs()
+            elif inference_config.get('compile', True):
+                self._compile_model()
+            
         except Exception as e:
             logger.error(f"Failed to load model: {e}")
             raise RuntimeError(f"Model loading failed: {e}")
     
+    def _load_onnx_session(self):
+        """
+        Export the loaded model to ONNX (once) and open an ONNX Runtime session
+        
+        The export is cached at `inference.onnx_path` and reused on later starts;
+        the default file name includes the precision and opset so changing either
+        produces a fresh export.
+        The PyTorch model is released afterwards since ONNX Runtime serves inference.
+        """
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("engine 'onnxruntime' requires the onnxruntime package") from e
+        
+        inference_config = self.config['inference']
+        default_path = os.path.join(
+            os.path.dirname(__file__), '..', '..', 'models',
+            f"{inference_config['model_name'].replace('/', '_')}"
+            f"-{inference_config.get('precision', 'fp32')}-opset{self.ONNX_OPSET}.onnx"
+        )
+        onnx_path = inference_config.get('onnx_path') or default_path
+        
+        if not os.path.exists(onnx_path):
+            logger.info(f"Exporting model to ONNX: {onnx_path}")
+            os.makedirs(os.path.dirname(os.path.abspath(onnx_path)), exist_ok=True)
+            
+            dummy = self._tokenize(["dummy headline"])
+            with torch.no_grad():
+                torch.onnx.export(
+                    self.model,
+                    (dummy['input_ids'].to(self.device), dummy['attention_mask'].to(self.device)),
+                    onnx_path,
+                    input_names=['input_ids', 'attention_mask'],
+                    output_names=['logits'],
+                    dynamic_axes={
+                        'input_ids': {0: 'batch', 1: 'sequence'},
+                        'attention_mask': {0: 'batch', 1: 'sequence'},
+                        'logits': {0: 'batch'}
+                    },
+                    opset_version=self.ONNX_OPSET
+                )
+        
+        session_options = ort.SessionOptions()
+        session_options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        
+        providers = self.ONNX_PROVIDERS[inference_config['device']]
+        self.onnx_session = ort.InferenceSession(
+            onnx_path, sess_options=session_options, providers=providers
+        )
+        logger.info(f"ONNX Runtime session ready. Providers: {self.onnx_session.get_providers()}")
+        
+        del self.model
+        self.model = None
+    
+    def _compile_model(self):
+        """
+        Compile the model with torch.compile (TorchInductor)
+        
+        dynamic=True keeps varying batch sizes and bucketed sequence lengths from
+        triggering a recompile per shape. Warm-up batches are run immediately so
+        compilation cost is paid at startup: one with several rows and one with a
+        single headline, since dynamo specializes size-1 dimensions even with
+        dynamic=True. If compilation is unavailable or fails for this platform, the
+        eager model is kept.
+        """
+        if not hasattr(torch, 'compile'):
+            logger.warning("torch.compile is unavailable in this PyTorch version, using eager mode")
+            return
+        
+        logger.info("Compiling model with torch.compile...")
+        eager_model = self.model
+        try:
+            self.model = torch.compile(eager_model, mode='reduce-overhead', fullgraph=False, dynamic=True)
+            
+            # Through the serving path, so the inputs are inference tensors as they are
+            # at serve time; tensors created outside inference_mode fail the graph's guards.
+            # Batch size 1 is specialized, so it gets its own graph.
+            self._process_batch_internal(
+                ["warm-up headline", "a longer warm-up headline so the batch needs padding"],
+                [0, 0]
+            )
+            self._process_batch_internal(["warm-up headline"], [0])
+            logger.info("Model compiled successfully")
+        except Exception as e:
+            logger.warning(f"torch.compile failed, falling back to eager mode: {e}")
+            self.model = eager_model
+    
+    def _connect_triton(self):
+        """
+        Connect to a Triton Inference Server hosting the model
+        
+        The model (e.g. a TensorRT engine built by scripts/build_tensorrt_engine.sh)
+        is served as `inference.triton_model` at `inference.triton_url`. Triton's
+        dynamic batcher additionally merges requests across clients.
+        """
+        try:
+            import tritonclient.grpc as triton_grpc
+        except ImportError as e:
+            raise RuntimeError("engine 'triton' requires the tritonclient[grpc] package") from e
+        
+        inference_config = self.config['inference']
+        url = inference_config.get('triton_url', 'localhost:8001')
+        model = inference_config.get('triton_model', 'finbert')
+        
+        self.triton_client = triton_grpc.InferenceServerClient(url=url)
+        if not self.triton_client.is_model_ready(model):
+            raise RuntimeError(f"Triton model '{model}' is not ready at {url}")
+        logger.info(f"Connected to Triton at {url}, model: {model}")
+    
+    def _capture_cuda_graphs(self):
+        """
+        Capture one CUDA graph of the forward pass per configured shape
+        
+        Each entry of `inference.cuda_graph_shapes` is a [batch, sequence_length]
+        pair; sequence lengths should match `sequence_buckets` so bucketed
+        sub-batches hit a graph. Replaying a graph launches the whole forward
+        pass at once instead of dispatching every kernel from Python.
+        """
+        shapes = sorted(tuple(shape) for shape in self.config['inference']['cuda_graph_shapes'])
+        logger.info(f"Capturing CUDA graphs for shapes: {shapes}")
+        
+        pool = None
+        with torch.inference_mode():
+            for batch, seq_len in shapes:
+                static_ids = torch.full(
+                    (batch, seq_len), self.tokenizer.pad_token_id, dtype=torch.int64, device=self.device
+                )
+                static_mask = torch.ones((batch, seq_len), dtype=torch.int64, device=self.device)
+                
+                # Warm up on a side stream before capture, as CUDA graphs require
+                stream = torch.cuda.Stream(self.device)
+                stream.wait_stream(torch.cuda.current_stream(self.device))
+                with torch.cuda.stream(stream):
+                    for _ in range(3):
+                        self.model(input_ids=static_ids, attention_mask=static_mask)
+                torch.cuda.current_stream(self.device).wait_stream(stream)
+                
+                graph = torch.cuda.CUDAGraph()
+                with torch.cuda.graph(graph, pool=pool):
+                    static_logits = self.model(input_ids=static_ids, attention_mask=static_mask).logits
+                
+                # All graphs share one memory pool; only one replays at a time
+                pool = graph.pool()
+                self._cuda_graphs[(batch, seq_len)] = (graph, static_ids, static_mask, static_logits)
+        
+        logger.info(f"Captured {len(self._cuda_graphs)} CUDA graphs")
+    
     def process_batch(self, headlines: List) -> List[Dict]:
         """
         Process a batch of headlines with FinBERT
@@ -100,80 +364,224 @@ class FinBertInferenceService(InferenceService):
         texts = [h.headline for h in headlines]
         timestamps = [h.timestamp for h in headlines]
         
+        return self._infer(texts, timestamps)
+    
+    def _infer(self, texts: List[str], timestamps: List[str]) -> List[Dict]:
+        """
+        Run texts through the model in sub-batches of at most batch_size
+        
+        Repeated texts (e.g. a wire story returned for several symbols) are
+        inferred once; each occurrence gets its own result dict carrying its
+        own timestamp, sharing the read-only probabilities dict.
+        
+        Args:
+            texts: List of headline texts
+            timestamps: List of corresponding timestamps
+            
+        Returns:
+            List of result dictionaries, in input order
+        """
+        # Map each text to the slot of its first occurrence
+        slots = {}
+        text_slots = []
+        unique_timestamps = []
+        for text, timestamp in zip(texts, timestamps):
+            slot = slots.get(text)
+            if slot is None:
+                slot = slots[text] = len(slots)
+                unique_timestamps.append(timestamp)
+            text_slots.append(slot)
+        
+        if len(slots) < len(texts):
+            logger.debug(f"Inferring {len(slots)} unique of {len(texts)} headlines")
+            unique_results = self._infer(list(slots), unique_timestamps)
+            return [
+                dict(unique_results[slot], timestamp=timestamp)
+                for slot, timestamp in zip(text_slots, timestamps)
+            ]
+        
+        # Sort by token length so each sub-batch pads to similar lengths
+        encodings = self._encode(texts)
+        order = np.argsort([len(ids) for ids in encodings], kind='stable')
+        
         # Process in batches according to config
         batch_size = self.config['inference']['batch_size']
-        all_results = []
+        all_results = [None] * len(texts)
         
         for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i + batch_size]
-            batch_timestamps = timestamps[i:i + batch_size]
+            batch_order = order[i:i + batch_size]
+            batch_texts = [texts[j] for j in batch_order]
+            batch_timestamps = [timestamps[j] for j in batch_order]
+            batch_encodings = [encodings[j] for j in batch_order]
             
             logger.debug(f"Processing sub-batch {i//batch_size + 1}: {len(batch_texts)} items")
-            batch_results = self._process_batch_internal(batch_texts, batch_timestamps)
-            all_results.extend(batch_results)
+            # Results are written straight to their pre-sort positions
+            self._process_batch_internal(
+                batch_texts, batch_timestamps, batch_encodings,
+                out=all_results, positions=batch_order
+            )
         
         return all_results
     
-    def _process_batch_internal(self, texts: List[str], timestamps: List[str]) -> List[Dict]:
+    def submit(self, headlines: List) -> List[Future]:
+        """
+        Enqueue headlines on the micro-batcher
+        
+        Falls back to inline processing when micro-batching is disabled.
+        
+        Args:
+            headlines: List of HeadlineRequest objects
+            
+        Returns:
+            List of futures, one per headline, resolving to its result dict
+        """
+        if self._request_queue is None:
+            return super().submit(headlines)
+        
+        pending = []
+        for h in headlines:
+            future = Future()
+            self._request_queue.put((h.headline, h.timestamp, future))
+            pending.append(future)
+        return pending
+    
+    def _start_batcher(self):
+        """Start the background thread that drains the micro-batch queue"""
+        window_ms = self.config['inference']['micro_batch_window_ms']
+        logger.info(f"Starting micro-batcher (window: {window_ms} ms)")
+        
+        self._request_queue = queue.Queue()
+        self._batcher_thread = threading.Thread(
+            target=self._batch_worker,
+            name="finbert-micro-batcher",
+            daemon=True
+        )
+        self._batcher_thread.start()
+    
+    def _batch_worker(self):
+        """
+        Micro-batching loop
+        
+        Blocks for the first pending headline, then keeps draining the queue
+        until batch_size items are collected or micro_batch_window_ms has
+        elapsed, and runs them through the model in a single call.
+        A None item on the queue stops the loop.
+        """
+        inference_config = self.config['inference']
+        batch_size = inference_config['batch_size']
+        window = inference_config['micro_batch_window_ms'] / 1000.0
+        
+        running = True
+        while running:
+            item = self._request_queue.get()
+            if item is None:
+                break
+            
+            pending = [item]
+            deadline = time.monotonic() + window
+            while len(pending) < batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    item = self._request_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if item is None:
+                    running = False
+                    break
+                pending.append(item)
+            
+            # Drop headlines whose caller has gone away (e.g. cancelled stream)
+            pending = [p for p in pending if p[2].set_running_or_notify_cancel()]
+            if not pending:
+                continue
+            
+            logger.debug(f"Micro-batch of {len(pending)} headlines")
+            texts = [p[0] for p in pending]
+            timestamps = [p[1] for p in pending]
+            
+            try:
+                results = self._infer(texts, timestamps)
+            except Exception as e:
+                logger.error(f"Micro-batch inference failed: {e}", exc_info=True)
+                for _, _, future in pending:
+                    future.set_exception(e)
+                continue
+            
+            for (_, _, future), result in zip(pending, results):
+                future.set_result(result)
+    
+    # inference_mode (unlike no_grad) also skips version counters and view tracking.
+    # As a decorator it applies in whichever thread runs the batch, e.g. the micro-batcher.
+    @torch.inference_mode()
+    def _process_batch_internal(
+        self,
+        texts: List[str],
+        timestamps: List[str],
+        encodings: Optional[List[Tuple[int, ...]]] = None,
+        out: Optional[List] = None,
+        positions: Optional[List[int]] = None
+    ) -> List[Dict]:
         """
         Internal method to process a single batch through the model
         
         Args:
             texts: List of headline texts
             timestamps: List of corresponding timestamps
+            encodings: Token ids for texts, if already encoded
+            out: Pre-sized list to write results into (a new list if omitted)
+            positions: Index in `out` for each text (defaults to 0..len(texts)-1)
             
         Returns:
-            List of result dictionaries
+            The list the results were written into
         """
-        max_length = self.config['inference']['max_sequence_length']
-        
         # Tokenize the batch
         logger.debug(f"Tokenizing {len(texts)} headlines...")
-        inputs = self.tokenizer(
-            texts,
-            padding=True,
-            truncation=True,
-            max_length=max_length,
-            return_tensors="pt"
-        )
+        inputs = self._tokenize(texts, encodings)
         
-        # Move inputs to device
-        inputs = {k: v.to(self.device) for k, v in inputs.items()}
+        # Move inputs to device; the copy overlaps with work still queued on the GPU
+        input_ids = inputs['input_ids'].to(self.device, non_blocking=True)
+        attention_mask = inputs['attention_mask'].to(self.device, non_blocking=True)
         
         # Run inference
         logger.debug("Running model inference...")
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            logits = outputs.logits
-            
-            # Get probabilities
-            probabilities = torch.nn.functional.softmax(logits, dim=-1)
-            
-            # Get predictions
-            predicted_classes = torch.argmax(probabilities, dim=-1)
-            confidence_scores = torch.max(probabilities, dim=-1).values
+        if self.engine == 'onnxruntime':
+            logits = self._forward_onnx(input_ids, attention_mask)
+        elif self.engine == 'triton':
+            logits = self._forward_triton(input_ids, attention_mask)
+        else:
+            logits = self._forward_torch(input_ids, attention_mask)
+        
+        # Get probabilities (softmax in FP32 for stability under fp16/bf16)
+        probabilities = torch.nn.functional.softmax(logits.float(), dim=-1)
+        
+        # Single device-to-host transfer; everything below works on host arrays
+        probs_np = probabilities.cpu().numpy()
+        predicted_classes = probs_np.argmax(axis=1)
+        confidence_scores = probs_np.max(axis=1).tolist()
+        predicted_labels = self.LABEL_NAMES[predicted_classes].tolist()
+        probs_rows = probs_np.tolist()
         
         # Build results
-        results = []
-        for idx, (text, timestamp) in enumerate(zip(texts, timestamps)):
-            predicted_label = self.LABEL_MAPPING[predicted_classes[idx].item()]
-            confidence = confidence_scores[idx].item()
-            
-            # Get all class probabilities
-            probs = probabilities[idx].cpu().numpy()
-            
-            result = {
+        results = out if out is not None else [None] * len(texts)
+        if positions is None:
+            positions = range(len(texts))
+        
+        for pos, text, timestamp, predicted_label, confidence, probs in zip(
+            positions, texts, timestamps, predicted_labels, confidence_scores, probs_rows
+        ):
+            results[pos] = {
                 "headline": text,
                 "timestamp": timestamp,
                 "sentiment": predicted_label,
-                "confidence": float(confidence),
+                "confidence": confidence,
                 "probabilities": {
-                    "positive": float(probs[0]),
-                    "negative": float(probs[1]),
-                    "neutral": float(probs[2])
+                    "positive": probs[0],
+                    "negative": probs[1],
+                    "neutral": probs[2]
                 }
             }
-            results.append(result)
             
             logger.debug(
                 f"Headline: '{text[:50]}...' → {predicted_label} "
@@ -182,6 +590,206 @@ class FinBertInferenceService(InferenceService):
         
         return results
     
+    def _tokenize(
+        self,
+        texts: List[str],
+        encodings: Optional[List[Tuple[int, ...]]] = None
+    ) -> Dict[str, torch.Tensor]:
+        """
+        Tokenize and right-pad a batch of texts
+        
+        Token ids are looked up per text in an LRU cache (FinnHub re-serves the
+        same headlines between polls); misses are encoded in one fast-tokenizer
+        call. token_type_ids are not produced since FinBERT classifies single
+        sequences and the model defaults them to zeros.
+        
+        Args:
+            texts: List of headline texts
+            encodings: Token ids for texts, if already encoded
+            
+        Returns:
+            Dict with int64 `input_ids` and `attention_mask` CPU tensors
+        """
+        if encodings is None:
+            encodings = self._encode(texts)
+        
+        shape = (len(texts), self._padded_length(max(len(ids) for ids in encodings)))
+        
+        # Page-locked host buffers let the host-to-device copy run asynchronously
+        pin = self.device is not None and self.device.type != 'cpu'
+        input_ids = torch.full(shape, self.tokenizer.pad_token_id, dtype=torch.int64, pin_memory=pin)
+        attention_mask = torch.zeros(shape, dtype=torch.int64, pin_memory=pin)
+        
+        # Fill through NumPy views of the same memory
+        ids_view, mask_view = input_ids.numpy(), attention_mask.numpy()
+        for row, ids in enumerate(encodings):
+            ids_view[row, :len(ids)] = ids
+            mask_view[row, :len(ids)] = 1
+        
+        return {'input_ids': input_ids, 'attention_mask': attention_mask}
+    
+    def _padded_length(self, longest: int) -> int:
+        """
+        Round a batch's longest sequence up to its length bucket
+        
+        Buckets come from `inference.sequence_buckets`; by default they are the
+        powers of two. Keeping the set of padded shapes small bounds padding
+        waste while letting shape-specialized kernels be reused.
+        
+        Args:
+            longest: Token count of the longest sequence in the batch
+            
+        Returns:
+            Sequence length to pad the batch to
+        """
+        inference_config = self.config['inference']
+        max_length = inference_config['max_sequence_length']
+        buckets = inference_config.get('sequence_buckets')
+        
+        if buckets:
+            bucket = next((b for b in sorted(buckets) if b >= longest), longest)
+        else:
+            bucket = 1 << (longest - 1).bit_length()
+        return max(longest, min(bucket, max_length))
+    
+    def _encode(self, texts: List[str]) -> List[Tuple[int, ...]]:
+        """
+        Encode texts to truncated token ids, going through the LRU cache
+        
+        Args:
+            texts: List of headline texts
+            
+        Returns:
+            List of token id tuples (including special tokens)
+        """
+        inference_config = self.config['inference']
+        cache_size = inference_config.get('tokenizer_cache_size', 8192)
+        
+        with self._token_cache_lock:
+            cached = [self._token_cache.get(text) for text in texts]
+            for text, ids in zip(texts, cached):
+                if ids is not None:
+                    self._token_cache.move_to_end(text)
+        
+        misses = list(dict.fromkeys(text for text, ids in zip(texts, cached) if ids is None))
+        if not misses:
+            return cached
+        
+        encoded = self.tokenizer(
+            misses,
+            truncation=True,
+            max_length=inference_config['max_sequence_length'],
+            return_attention_mask=False,
+            return_token_type_ids=False
+        )['input_ids']
+        new_ids = dict(zip(misses, map(tuple, encoded)))
+        
+        if cache_size > 0:
+            with self._token_cache_lock:
+                self._token_cache.update(new_ids)
+                while len(self._token_cache) > cache_size:
+                    self._token_cache.popitem(last=False)
+        
+        return [ids if ids is not None else new_ids[text] for text, ids in zip(texts, cached)]
+    
+    def _forward_torch(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """
+        Run the PyTorch model, replaying a captured CUDA graph when one fits
+        
+        A graph fits if it was captured for the batch's sequence length and at
+        least as many rows; unused rows are filled with padding and their
+        logits discarded. Other shapes run eagerly.
+        
+        Args:
+            input_ids: Token ids on self.device
+            attention_mask: Attention mask on self.device
+            
+        Returns:
+            Logits on self.device
+        """
+        rows, seq_len = input_ids.shape
+        key = min(
+            ((batch, length) for batch, length in self._cuda_graphs if length == seq_len and batch >= rows),
+            default=None
+        )
+        if key is None:
+            return self.model(input_ids=input_ids, attention_mask=attention_mask).logits
+        
+        graph, static_ids, static_mask, static_logits = self._cuda_graphs[key]
+        static_ids[:rows].copy_(input_ids)
+        static_mask[:rows].copy_(attention_mask)
+        if rows < key[0]:
+            static_ids[rows:].fill_(self.tokenizer.pad_token_id)
+            static_mask[rows:].fill_(1)
+        
+        graph.replay()
+        return static_logits[:rows]
+    
+    def _forward_onnx(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """
+        Run the ONNX Runtime session with IO binding
+        
+        Inputs are bound directly from the device tensors' memory, so no extra
+        host/device copies are made; only the (batch x num_labels) logits are
+        copied back to the host.
+        
+        Args:
+            input_ids: Token ids on self.device
+            attention_mask: Attention mask on self.device
+            
+        Returns:
+            Logits as a CPU tensor
+        """
+        device_type = 'cpu' if self.device.type == 'cpu' else 'cuda'
+        device_id = self.device.index or 0
+        
+        # Keep references to the bound tensors until the run completes
+        bound = {
+            'input_ids': input_ids.contiguous().to(torch.int64),
+            'attention_mask': attention_mask.contiguous().to(torch.int64)
+        }
+        
+        io_binding = self.onnx_session.io_binding()
+        for name, tensor in bound.items():
+            io_binding.bind_input(
+                name, device_type, device_id, np.int64, tuple(tensor.shape), tensor.data_ptr()
+            )
+        io_binding.bind_output('logits', device_type, device_id)
+        
+        # The inputs were copied non_blocking on torch's stream, which ONNX Runtime
+        # does not wait on; make sure the copies have landed before it reads them
+        if self.device.type != 'cpu':
+            torch.cuda.current_stream(self.device).synchronize()
+        
+        self.onnx_session.run_with_iobinding(io_binding)
+        return torch.from_numpy(io_binding.copy_outputs_to_cpu()[0])
+    
+    def _forward_triton(self, input_ids: torch.Tensor, attention_mask: torch.Tensor) -> torch.Tensor:
+        """
+        Run the batch on the Triton Inference Server
+        
+        Args:
+            input_ids: Token ids (CPU tensor)
+            attention_mask: Attention mask (CPU tensor)
+            
+        Returns:
+            Logits as a CPU tensor
+        """
+        import tritonclient.grpc as triton_grpc
+        
+        inputs = []
+        for name, tensor in (('input_ids', input_ids), ('attention_mask', attention_mask)):
+            infer_input = triton_grpc.InferInput(name, list(tensor.shape), 'INT64')
+            infer_input.set_data_from_numpy(tensor.numpy())
+            inputs.append(infer_input)
+        
+        result = self.triton_client.infer(
+            self.config['inference'].get('triton_model', 'finbert'),
+            inputs,
+            outputs=[triton_grpc.InferRequestedOutput('logits')]
+        )
+        return torch.from_numpy(result.as_numpy('logits'))
+    
     def _process_single(self, headline_text: str, timestamp: str) -> Dict:
         """
         Process a single headline (wrapper around batch processing)
@@ -205,12 +813,26 @@ class FinBertInferenceService(InferenceService):
     def cleanup(self):
         """Clean up model resources"""
         logger.info("Cleaning up FinBERT resources...")
+        if self._batcher_thread is not None:
+            self._request_queue.put(None)
+            self._batcher_thread.join()
+            self._batcher_thread = None
+            self._request_queue = None
+        
         if self.model is not None:
             del self.model
             self.model = None
+        if self.onnx_session is not None:
+            del self.onnx_session
+            self.onnx_session = None
+        if self.triton_client is not None:
+            self.triton_client.close()
+            self.triton_client = None
+        self._cuda_graphs.clear()
         if self.tokenizer is not None:
             del self.tokenizer
             self.tokenizer = None
+        self._token_cache.clear()
         
         # Clear GPU cache if using GPU
         if self.device and self.device.type in ['cuda', 'rocm']:
@@ -0,0 +1,50 @@
+import importlib
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Module defining each implementation, imported only when that implementation
+# is requested so unused backends (and their torch/transformers imports) never load
+_IMPLEMENTATION_MODULES = {
+    'finbert': '.finbert_inference_service',
+}
+
+# Implementation name -> InferenceService subclass, filled in by @register
+_REGISTRY = {}
+
+
+def register(name: str):
+    """
+    Class decorator registering an InferenceService implementation
+    
+    Args:
+        name: Value of `inference.implementation` that selects this class
+    """
+    def decorator(cls):
+        _REGISTRY[name] = cls
+        return cls
+    return decorator
+
+
+def get_implementation(name: str):
+    """
+    Look up an implementation class by name, importing its module on first use
+    
+    Args:
+        name: Implementation name
+        
+    Returns:
+        The registered InferenceService subclass
+        
+    Raises:
+        ValueError: If no implementation is registered under this name
+    """
+    if name not in _REGISTRY and name in _IMPLEMENTATION_MODULES:
+        logger.debug(f"Importing implementation module for '{name}'")
+        importlib.import_module(_IMPLEMENTATION_MODULES[name], package=__package__)
+    
+    try:
+        return _REGISTRY[name]
+    except KeyError:
+        known = ', '.join(sorted(set(_REGISTRY) | set(_IMPLEMENTATION_MODULES)))
+        raise ValueError(f"Unknown implementation: {name} (known: {known})") from None
@@ -0,0 +1,121 @@
+"""
+Multi-process inference for CPU deployments
+
+Each worker process loads its own copy of the model and runs with a share
+of the CPU cores, so forward passes run in parallel instead of contending
+for the GIL and for one process's intra-op thread pool.
+"""
+
+import logging
+import multiprocessing
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from types import SimpleNamespace
+from typing import List, Tuple
+from src.factory import create_inference_service
+
+logger = logging.getLogger(__name__)
+
+# Inference service owned by the current worker process
+_worker_service = None
+
+
+def _init_worker(config, num_threads: int):
+    """Load the model in a freshly spawned worker process"""
+    global _worker_service
+    import torch
+    torch.set_num_threads(num_threads)
+    _worker_service = create_inference_service(config)
+    logger.info(f"Inference worker {os.getpid()} ready ({num_threads} threads)")
+
+
+def _worker_ready(barrier) -> int:
+    """
+    Startup task used to wait for a worker to finish loading
+
+    Every task blocks on a shared barrier, so each of the pool's tasks is
+    held by a different worker and all of them have to be spawned.
+    """
+    barrier.wait()
+    return os.getpid()
+
+
+def _worker_process_batch(items: List[Tuple[str, int]]) -> List[dict]:
+    """Run a batch of (headline, timestamp) pairs through the worker's model"""
+    headlines = [SimpleNamespace(headline=text, timestamp=timestamp) for text, timestamp in items]
+    return _worker_service.process_batch(headlines)
+
+
+class InferenceWorkerPool:
+    """
+    Pool of inference worker processes
+
+    Exposes the same submit()/process_batch()/cleanup() surface as
+    InferenceService so the servicer can use either.
+    """
+
+    def __init__(self, config, num_workers: int):
+        """
+        Spawn the worker processes
+
+        Args:
+            config: Full configuration dictionary, passed to each worker
+            num_workers: Number of worker processes
+        """
+        num_threads = max(1, (os.cpu_count() or 1) // num_workers)
+        logger.info(f"Starting {num_workers} inference worker processes ({num_threads} threads each)")
+
+        # Read by OpenMP when a worker imports torch; spawned workers inherit it
+        os.environ['OMP_NUM_THREADS'] = str(num_threads)
+
+        self._executor = ProcessPoolExecutor(
+            max_workers=num_workers,
+            mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_worker,
+            initargs=(config, num_threads)
+        )
+
+        # Load the model in every worker, surfacing failures at startup rather than
+        # on the first batch. The executor reuses idle workers, so a single task
+        # would only start one of them.
+        with multiprocessing.get_context('spawn').Manager() as manager:
+            barrier = manager.Barrier(num_workers)
+            ready = [self._executor.submit(_worker_ready, barrier) for _ in range(num_workers)]
+            pids = [future.result() for future in ready]
+        logger.info(f"All {len(set(pids))} inference workers ready")
+
+    def submit(self, headlines: List) -> List[Future]:
+        """
+        Dispatch a batch of headlines to a worker process
+
+        Args:
+            headlines: List of HeadlineRequest objects
+
+        Returns:
+            List of futures, one per headline, resolving to its result dict
+        """
+        items = [(h.headline, h.timestamp) for h in headlines]
+        batch_future = self._executor.submit(_worker_process_batch, items)
+        pending = [Future() for _ in items]
+
+        def _fan_out(done: Future):
+            error = done.exception()
+            for i, future in enumerate(pending):
+                if not future.set_running_or_notify_cancel():
+                    continue
+                if error is not None:
+                    future.set_exception(error)
+                else:
+                    future.set_result(done.result()[i])
+
+        batch_future.add_done_callback(_fan_out)
+        return pending
+
+    def process_batch(self, headlines: List) -> List[dict]:
+        """Process a batch of headlines on a worker process and wait for the results"""
+        return [future.result() for future in self.submit(headlines)]
+
+    def cleanup(self):
+        """Stop the worker processes"""
+        logger.info("Stopping inference worker processes...")
+        self._executor.shutdown(wait=True, cancel_futures=True)